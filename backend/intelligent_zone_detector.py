@@ -15,6 +15,8 @@ import logging
 import re
 from pathlib import Path
 
+from backend.preprocessing import get_clahe
+
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -54,6 +56,46 @@ class Zone:
         if self.features is None:
             self.features = {}
 
+# Patterns pour la classification sémantique
+_SEMANTIC_PATTERN_STRINGS = {
+    ZoneType.HEADER: [
+        r'facture|invoice|devis|quote|bon de commande',
+        r'société|company|entreprise|sarl|sas|sa\b',
+        r'n°\s*\d+|numero|number'
+    ],
+    ZoneType.DATE: [
+        r'\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4}',
+        r'\d{1,2}\s+(janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre)',
+        r'date\s*:',
+        r'\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4}'
+    ],
+    ZoneType.PRICE: [
+        r'\d+[,\.]\d{2}\s*€',
+        r'€\s*\d+[,\.]\d{2}',
+        r'total|montant|prix|price|amount',
+        r'tva|ht|ttc|tax'
+    ],
+    ZoneType.ADDRESS: [
+        r'\d+\s+rue|avenue|boulevard|place|chemin',
+        r'\d{5}\s+[a-zA-Z]+',
+        r'adresse|address'
+    ],
+    ZoneType.REFERENCE: [
+        r'ref\s*:?\s*\w+',
+        r'référence|reference',
+        r'n°|num|number'
+    ],
+    ZoneType.SIGNATURE: [
+        r'signature|signé|signed',
+        r'cachet|stamp'
+    ]
+}
+
+# Une alternation par type de zone: une seule recherche par (zone, type) au lieu d'une par pattern
+_SEMANTIC_ZONE_PATTERNS = {zone_type: re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+                           for zone_type, patterns in _SEMANTIC_PATTERN_STRINGS.items()}
+
+
 class IntelligentZoneDetector:
     """Détecteur intelligent de zones avec classification sémantique"""
     
@@ -63,40 +105,9 @@ class IntelligentZoneDetector:
         self.image_shape = None
         self.debug_mode = True  # Activer le debug par défaut pour diagnostiquer les problèmes
         
-        # Patterns pour la classification sémantique
-        self.semantic_patterns = {
-            ZoneType.HEADER: [
-                r'facture|invoice|devis|quote|bon de commande',
-                r'société|company|entreprise|sarl|sas|sa\b',
-                r'n°\s*\d+|numero|number'
-            ],
-            ZoneType.DATE: [
-                r'\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4}',
-                r'\d{1,2}\s+(janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre)',
-                r'date\s*:',
-                r'\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4}'
-            ],
-            ZoneType.PRICE: [
-                r'\d+[,\.]\d{2}\s*€',
-                r'€\s*\d+[,\.]\d{2}',
-                r'total|montant|prix|price|amount',
-                r'tva|ht|ttc|tax'
-            ],
-            ZoneType.ADDRESS: [
-                r'\d+\s+rue|avenue|boulevard|place|chemin',
-                r'\d{5}\s+[a-zA-Z]+',
-                r'adresse|address'
-            ],
-            ZoneType.REFERENCE: [
-                r'ref\s*:?\s*\w+',
-                r'référence|reference',
-                r'n°|num|number'
-            ],
-            ZoneType.SIGNATURE: [
-                r'signature|signé|signed',
-                r'cachet|stamp'
-            ]
-        }
+        # Patterns pour la classification sémantique (partagés par le module, compilés dans
+        # _SEMANTIC_ZONE_PATTERNS)
+        self.semantic_patterns = _SEMANTIC_PATTERN_STRINGS
     
     def detect_and_classify_zones(self, image_path: str, output_dir: str = "output/intelligent_zones") -> Dict:
         """
@@ -245,8 +256,7 @@ class IntelligentZoneDetector:
         """Détecte les zones candidates avec approche multi-échelle - Version plus permissive"""
         
         # Préprocessing adaptatif
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        enhanced = clahe.apply(gray_image)
+        enhanced = get_clahe(2.0, (8, 8)).apply(gray_image)
         
         # Débruitage léger
         denoised = cv2.bilateralFilter(enhanced, 5, 50, 50)
@@ -453,8 +463,7 @@ class IntelligentZoneDetector:
                 gray_zone = zone_image
 
             # Amélioration du contraste
-            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-            enhanced = clahe.apply(gray_zone)
+            enhanced = get_clahe(2.0, (8, 8)).apply(gray_zone)
 
             # Binarisation
             _, binary = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
@@ -512,10 +521,9 @@ class IntelligentZoneDetector:
         text_lower = text.lower().strip()
 
         # Classification basée sur les patterns sémantiques
-        for zone_type, patterns in self.semantic_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text_lower, re.IGNORECASE):
-                    return zone_type
+        for zone_type, pattern in _SEMANTIC_ZONE_PATTERNS.items():
+            if pattern.search(text_lower):
+                return zone_type
 
         # Classification basée sur la position et les dimensions
         image_height = self.image_shape[0] if self.image_shape else 1000
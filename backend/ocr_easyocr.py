@@ -4,9 +4,10 @@ Priorité aux modèles locaux, fallback vers installation système
 Optimisé pour fonctionnement offline-first
 """
 import os
-import glob
 import shutil
+import types
 import warnings
+import numpy as np
 warnings.filterwarnings("ignore")
 
 # Variables globales pour la configuration
@@ -14,6 +15,23 @@ EASYOCR_READER = None
 USING_LOCAL_MODELS = False
 LOCAL_MODEL_PATH = None
 
+# Mapping des fichiers de modèles de reconnaissance vers les codes de langue
+# (craft_mlt_25k.pth est le modèle de détection, il ne correspond à aucune langue)
+_MODEL_TO_LANG = types.MappingProxyType({
+    'english_g2.pth': 'en',
+    'latin_g2.pth': 'fr',  # Latin couvre le français
+})
+
+
+def _list_model_files(model_dir):
+    """
+    Noms des fichiers de modèles (.pth) d'un dossier, en un seul parcours os.scandir
+    (mêmes fichiers que glob('*.pth'): les fichiers cachés sont ignorés)
+    """
+    with os.scandir(model_dir) as entries:
+        return [entry.name for entry in entries
+                if entry.name.endswith('.pth') and not entry.name.startswith('.')]
+
 
 def get_local_model_path():
     """
@@ -26,8 +44,7 @@ def get_local_model_path():
 
     if os.path.exists(local_model_dir):
         # Vérifier qu'il y a des modèles (.pth)
-        model_files = glob.glob(os.path.join(local_model_dir, '*.pth'))
-        if model_files:
+        if _list_model_files(local_model_dir):
             return local_model_dir
 
     return None
@@ -40,8 +57,7 @@ def get_available_model_files(model_path):
     if not model_path or not os.path.exists(model_path):
         return []
 
-    model_files = glob.glob(os.path.join(model_path, '*.pth'))
-    return [os.path.basename(f) for f in model_files]
+    return _list_model_files(model_path)
 
 
 def detect_supported_languages(model_path):
@@ -51,27 +67,11 @@ def detect_supported_languages(model_path):
     if not model_path:
         return ['en']  # Fallback par défaut
 
-    model_files = get_available_model_files(model_path)
-    supported_languages = []
-
-    # Mapping des fichiers de modèles vers les codes de langue
-    language_mapping = {
-        'english_g2.pth': 'en',
-        'latin_g2.pth': 'fr',  # Latin couvre le français
-        'craft_mlt_25k.pth': None  # Modèle de détection de texte
-    }
-
-    for model_file in model_files:
-        if model_file in language_mapping:
-            lang = language_mapping[model_file]
-            if lang and lang not in supported_languages:
-                supported_languages.append(lang)
+    # Ensemble des langues couvertes par les modèles présents
+    languages = {_MODEL_TO_LANG[f] for f in get_available_model_files(model_path) if f in _MODEL_TO_LANG}
 
     # Si aucune langue détectée, utiliser anglais par défaut
-    if not supported_languages:
-        supported_languages = ['en']
-
-    return sorted(supported_languages)
+    return sorted(languages) or ['en']
 
 
 def configure_easyocr():
@@ -82,6 +82,14 @@ def configure_easyocr():
     """
     global EASYOCR_READER, USING_LOCAL_MODELS, LOCAL_MODEL_PATH
 
+    # OCR désactivé ou autre moteur demandé: ne pas construire le reader
+    if os.environ.get("OCR_DISABLED") == "1" or os.environ.get("OCR_BACKEND", "easyocr") != "easyocr":
+        print("[INFO] EasyOCR désactivé (OCR_DISABLED / OCR_BACKEND)")
+        EASYOCR_READER = None
+        USING_LOCAL_MODELS = False
+        LOCAL_MODEL_PATH = None
+        return False, False
+
     print("[CONFIG] Configuration EasyOCR...")
 
     # Étape 1: Vérifier les modèles locaux
@@ -225,19 +233,16 @@ def ocr_easyocr(image_path, return_conf=True, verbose=False):
 
         results = EASYOCR_READER.readtext(image_path)
 
-        # Traiter les résultats
-        lines = []
-        confidences = []
-
-        for detection in results:
-            # EasyOCR retourne (bbox, text, confidence)
-            text = detection[1].strip()
-            confidence = detection[2] * 100  # Convertir en pourcentage
+        # Traiter les résultats: EasyOCR retourne (bbox, text, confidence)
+        # Confiances converties en pourcentage dans un seul tableau NumPy
+        texts = [detection[1].strip() for detection in results]
+        confs = np.fromiter((detection[2] for detection in results), dtype=np.float64, count=len(results)) * 100.0
 
-            # Filtrer les détections avec très faible confiance ou texte vide
-            if text and confidence > 10:  # Seuil minimum de confiance
-                lines.append(text)
-                confidences.append(confidence)
+        # Filtrer les détections avec très faible confiance ou texte vide
+        keep = confs > 10  # Seuil minimum de confiance
+        keep &= np.fromiter((bool(text) for text in texts), dtype=bool, count=len(texts))
+        lines = [text for text, kept in zip(texts, keep) if kept]
+        confidences = confs[keep].tolist()
 
         if verbose:
             avg_conf = sum(confidences) / len(confidences) if confidences else 0
@@ -309,10 +314,9 @@ def test_easyocr_configuration():
         print(f"   Fichiers: {', '.join(local_models) if local_models else 'Aucun'}")
 
         # Lister les fichiers de modèles avec tailles
-        model_files = glob.glob(os.path.join(local_model_path, '*.pth'))
-        for model_file in model_files:
-            size = os.path.getsize(model_file)
-            print(f"   [FILE] {os.path.basename(model_file)} ({size:,} bytes)")
+        for model_file in local_models:
+            size = os.path.getsize(os.path.join(local_model_path, model_file))
+            print(f"   [FILE] {model_file} ({size:,} bytes)")
     else:
         print(f"\n[FOLDER] Modèles locaux: Non trouvés")
 
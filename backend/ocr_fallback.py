@@ -7,6 +7,7 @@ def simple_ocr_fallback(image_path):
         import cv2
         import numpy as np
         from PIL import Image, ImageDraw, ImageFont
+        from backend.preprocessing import get_clahe
         
         # Charger l'image
         image = cv2.imread(image_path)
@@ -16,9 +17,14 @@ def simple_ocr_fallback(image_path):
         # Conversion en niveaux de gris
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         
+        # Réduction à 1000 px max: la détection de régions reste grossière,
+        # inutile de faire CLAHE / Otsu / contours en pleine résolution
+        scale = min(1.0, 1000.0 / max(gray.shape))
+        if scale < 1.0:
+            gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        
         # Amélioration du contraste
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        enhanced = clahe.apply(gray)
+        enhanced = get_clahe(2.0, (8, 8)).apply(gray)
         
         # Binarisation
         _, binary = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
@@ -29,29 +35,28 @@ def simple_ocr_fallback(image_path):
         text_lines = []
         confidences = []
         
+        # Libellé invariant pour les zones hors en-tête (calculé une seule fois)
+        is_invoice = "facture" in image_path.lower()
+        label_body = "Informations de facture" if is_invoice else "Zone de texte détectée"
+        
         for contour in contours:
             x, y, w, h = cv2.boundingRect(contour)
-            area = w * h
+            
+            # Dimensions ramenées à la résolution d'origine pour les seuils
+            orig_y, orig_w, orig_h = y / scale, w / scale, h / scale
+            area = orig_w * orig_h
             
             # Filtrer les zones trop petites ou trop grandes
-            if 100 < area < 10000 and w > 20 and h > 10:
-                # Extraire la zone
-                roi = gray[y:y+h, x:x+w]
-                
-                # Estimation basée sur la densité de pixels
-                _, roi_binary = cv2.threshold(roi, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-                text_pixels = cv2.countNonZero(roi_binary)
-                total_pixels = roi.size
+            if 100 < area < 10000 and orig_w > 20 and orig_h > 10:
+                # Estimation basée sur la densité de pixels, directement sur
+                # l'image déjà binarisée (pas de second Otsu par zone)
+                text_pixels = int(binary[y:y+h, x:x+w].sum() // 255)
+                total_pixels = w * h
                 density = text_pixels / total_pixels
                 
                 if 0.1 < density < 0.9:  # Zone avec du texte probable
-                    # Estimation du texte basée sur la position et la taille
-                    if y < 100:  # Zone en haut
-                        text_lines.append("En-tête de document")
-                    elif "facture" in image_path.lower():
-                        text_lines.append("Informations de facture")
-                    else:
-                        text_lines.append("Zone de texte détectée")
+                    # Estimation du texte basée sur la position (zone en haut = en-tête)
+                    text_lines.append("En-tête de document" if orig_y < 100 else label_body)
                     
                     # Confiance basée sur la qualité de la zone
                     confidence = min(85.0, 50.0 + density * 50.0)
@@ -7,15 +7,82 @@ import cv2
 import numpy as np
 import pytesseract
 from pytesseract import Output
-import glob
 import subprocess
 import os
+import re
 import shutil
+import functools
+import atexit
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from PIL import Image
+
+# tesserocr (liaison directe à libtesseract) est optionnel: s'il est installé,
+# les modèles de langue restent chargés en mémoire entre les appels
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    tesserocr = None
+    TESSEROCR_AVAILABLE = False
 
 # Variables globales déclarées au niveau du module
 USING_LOCAL_MODELS = False
-TESSDATA_PREFIX = ""
-
+# Lu une seule fois: configure_tesseract() le met à jour, il n'est plus modifié ensuite
+TESSDATA_PREFIX = os.environ.get('TESSDATA_PREFIX', "")
+_OPTIMAL_LANG = 'eng'  # Calculée une seule fois par configure_tesseract()
+
+# Configuration différée au premier usage (pas de sous-processus à l'import du module)
+TESSERACT_AVAILABLE = None
+_CONFIG_LOCK = threading.Lock()
+
+# Instance tesserocr résidente (non thread-safe, protégée par un verrou)
+_API = None
+_API_LOCK = threading.Lock()
+
+# Pool de processus pour le traitement par lots (créé au premier lot, une API résidente par processus,
+# arrêté à la sortie de l'interpréteur)
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+# Configurations restantes lancées en parallèle (threads) quand la première n'atteint pas le seuil
+# d'arrêt anticipé; désactivé dans les processus du pool, qui occupent déjà un cœur chacun
+_PARALLEL_CONFIGS = True
+
+# Version majeure/mineure dans la sortie de `tesseract --version` (ex: "tesseract v5.3.0.20221214")
+_VER_RE = re.compile(rb'tesseract\s+v?(\d+)\.(\d+)', re.I)
+
+# Caractères autorisés pour la passe "whitelist" optionnelle (ocr_tesseract(..., use_whitelist=True))
+WHITELIST = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789€°.,;:!?()[]{}+-*/=@#&%"
+
+# Configurations Tesseract essayées: (libellé, PSM, restriction aux caractères de WHITELIST)
+# PSM 6: Assume a single uniform block of text
+# PSM 3: Fully automatic page segmentation, but no OSD
+# PSM 4: Assume a single column of text of variable sizes
+# Pas de whitelist par défaut: elle prive le moteur LSTM d'une partie de ses hypothèses
+# (accents, symboles) et ralentit la recherche; la passe whitelist reste disponible sur demande
+_CONFIGS = (
+    ('6', 6, False),
+    ('3', 3, False),
+    ('4', 4, False),
+)
+_WHITELIST_CONFIG = ('6 (whitelist)', 6, True)
+
+# Taux de victoire de chaque configuration (moyenne mobile exponentielle sur la session):
+# une configuration qui gagne nettement plus souvent que les autres (taux >= _WIN_RATE_DOMINANT,
+# soit au moins 9 victoires consécutives depuis le début de session) passe avant l'heuristique
+# de mise en page pour la première passe, exécutée seule
+# Partagé entre les appels concurrents: lecture et mise à jour sous _WIN_RATES_LOCK
+_WIN_RATE_ALPHA = 0.1
+_WIN_RATE_DOMINANT = 0.6
+_WIN_RATES = {config: 0.0 for config in (_WHITELIST_CONFIG,) + _CONFIGS}
+_WIN_RATES_LOCK = threading.Lock()
+
+# Confiance moyenne (%) à partir de laquelle les configurations suivantes ne sont pas essayées
+EARLY_EXIT_THRESHOLD = 88.0
+
+@functools.lru_cache(maxsize=None)
 def get_local_tessdata_path():
     """
     Trouve le chemin vers les modèles Tesseract locaux
@@ -28,26 +95,82 @@ def get_local_tessdata_path():
     
     return None
 
+@functools.lru_cache(maxsize=8)
 def get_available_languages(tessdata_path):
     """
     Liste les langues disponibles dans un dossier tessdata
+    Résultat mis en cache par chemin (tuple immuable, partagé entre les appelants)
     """
-    if not tessdata_path or not os.path.exists(tessdata_path):
-        return []
-    
-    # Chercher les fichiers .traineddata
-    traineddata_files = glob.glob(os.path.join(tessdata_path, '*.traineddata'))
-    
-    # Extraire les codes de langue
-    languages = []
-    for file_path in traineddata_files:
-        filename = os.path.basename(file_path)
-        language_code = filename.replace('.traineddata', '')
-        languages.append(language_code)
-    
-    return sorted(languages)
+    if not tessdata_path:
+        return ()
+
+    # Un seul parcours du dossier: le code de langue est le nom du fichier sans '.traineddata'
+    try:
+        with os.scandir(tessdata_path) as entries:
+            return tuple(sorted(entry.name[:-12] for entry in entries if entry.name.endswith('.traineddata')))
+    except OSError:
+        return ()
+
+def find_tesseract_install(parent_dirs):
+    """
+    Cherche une installation Tesseract-OCR dans les dossiers parents candidats
+    Un seul parcours (os.scandir) par dossier d'installation au lieu d'un os.path.exists par fichier
+
+    Returns:
+        (str, str): Chemin de l'exécutable et du dossier tessdata (None si absent), ou (None, None)
+    """
+    for parent_dir in parent_dirs:
+        install_dir = os.path.join(parent_dir, 'Tesseract-OCR')
+        try:
+            with os.scandir(install_dir) as entries:
+                names = {entry.name.lower() for entry in entries}
+        except OSError:
+            continue
+
+        if 'tesseract.exe' in names:
+            tessdata_path = os.path.join(install_dir, 'tessdata') if 'tessdata' in names else None
+            return os.path.join(install_dir, 'tesseract.exe'), tessdata_path
+
+    return None, None
+
+def _compute_optimal_language(available):
+    """
+    Détermine la configuration de langue optimale basée sur les modèles disponibles
+    Priorité: fra+eng si disponible, sinon eng, sinon premier disponible
+    """
+    if not available:
+        return 'eng'  # Fallback par défaut
+
+    if not TESSDATA_PREFIX:
+        return 'eng'  # Fallback par défaut
+
+    available_languages = get_available_languages(TESSDATA_PREFIX)
+
+    if not available_languages:
+        return 'eng'  # Fallback par défaut
+
+    # Priorité aux langues françaises et anglaises
+    if 'fra' in available_languages and 'eng' in available_languages:
+        return 'fra+eng'
+    elif 'fra' in available_languages:
+        return 'fra'
+    elif 'eng' in available_languages:
+        return 'eng'
+    else:
+        # Utiliser la première langue disponible
+        return available_languages[0]
 
 def configure_tesseract():
+    """
+    Configure Tesseract et mémorise la configuration de langue optimale
+    """
+    global _OPTIMAL_LANG
+
+    available = _configure_tesseract_install()
+    _OPTIMAL_LANG = _compute_optimal_language(available)
+    return available
+
+def _configure_tesseract_install():
     """
     Configure Tesseract avec priorité à la version système 5.x
     """
@@ -56,28 +179,29 @@ def configure_tesseract():
     print("[CONFIG] Configuration Tesseract...")
 
     # FORCER l'utilisation de la bonne installation Tesseract 5.x
-    tesseract_5x_path = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
-    tessdata_5x_path = r"C:\Program Files\Tesseract-OCR\tessdata"
+    tesseract_5x_path, tessdata_5x_path = find_tesseract_install([r"C:\Program Files"])
     
-    if os.path.exists(tesseract_5x_path):
+    if tesseract_5x_path:
         print(f"[FORCE] Utilisation forcée de Tesseract 5.x: {tesseract_5x_path}")
         
         # Vérifier la version
         try:
             result = subprocess.run([tesseract_5x_path, '--version'], 
-                                  capture_output=True, text=True, timeout=10)
+                                  capture_output=True, timeout=10)
             if result.returncode == 0:
-                version_output = result.stdout.strip()
+                version_output = result.stdout.decode('utf-8', 'replace').strip()
                 print(f"[VERSION] {version_output}")
                 
-                if "5." in version_output:
+                version_match = _VER_RE.search(result.stdout)
+                major = int(version_match.group(1)) if version_match else 0
+                if major == 5:
                     print("[OK] Tesseract 5.x confirmé")
                     
                     # Configurer pytesseract pour utiliser le bon chemin
                     pytesseract.pytesseract.tesseract_cmd = tesseract_5x_path
                     
                     # Configurer TESSDATA_PREFIX pour utiliser le bon dossier
-                    if os.path.exists(tessdata_5x_path):
+                    if tessdata_5x_path:
                         os.environ['TESSDATA_PREFIX'] = tessdata_5x_path
                         TESSDATA_PREFIX = tessdata_5x_path
                         USING_LOCAL_MODELS = False
@@ -87,10 +211,10 @@ def configure_tesseract():
                         # Vérifier les langues disponibles
                         try:
                             result = subprocess.run([tesseract_5x_path, '--list-langs'], 
-                                                  capture_output=True, text=True, timeout=10)
+                                                  capture_output=True, timeout=10)
                             if result.returncode == 0:
-                                languages = result.stdout.strip().split('\n')[1:]
-                                languages = [lang.strip() for lang in languages if lang.strip()]
+                                # Première ligne: en-tête "List of available languages..."
+                                languages = [lang.strip().decode('ascii', 'ignore') for lang in result.stdout.splitlines()[1:] if lang.strip()]
                                 print(f"[LANG] Langues disponibles: {', '.join(languages)}")
                                 
                                 if 'fra' in languages and 'eng' in languages:
@@ -99,19 +223,19 @@ def configure_tesseract():
                                 else:
                                     print("[WARNING] Langues manquantes")
                             else:
-                                print(f"[ERROR] Erreur liste langues: {result.stderr}")
+                                print(f"[ERROR] Erreur liste langues: {result.stderr.decode('utf-8', 'replace')}")
                         except Exception as e:
                             print(f"[ERROR] Erreur vérification langues: {e}")
                     else:
-                        print(f"[ERROR] Dossier tessdata non trouvé: {tessdata_5x_path}")
+                        print(f"[ERROR] Dossier tessdata non trouvé: {os.path.join(os.path.dirname(tesseract_5x_path), 'tessdata')}")
                 else:
                     print("[ERROR] Version Tesseract incorrecte")
             else:
-                print(f"[ERROR] Erreur version: {result.stderr}")
+                print(f"[ERROR] Erreur version: {result.stderr.decode('utf-8', 'replace')}")
         except Exception as e:
             print(f"[ERROR] Erreur vérification: {e}")
     else:
-        print(f"[ERROR] Tesseract 5.x non trouvé: {tesseract_5x_path}")
+        print(r"[ERROR] Tesseract 5.x non trouvé: C:\Program Files\Tesseract-OCR\tesseract.exe")
 
     print("[WARNING] Fallback vers les modèles locaux")
     
@@ -150,18 +274,16 @@ def configure_tesseract():
         program_files_x86 = os.environ.get('PROGRAMFILES(X86)', 'C:\\Program Files (x86)')
         user_profile = os.environ.get('USERPROFILE', '')
 
-        possible_paths = [
-            os.path.join(program_files, 'Tesseract-OCR', 'tesseract.exe'),
-            os.path.join(program_files_x86, 'Tesseract-OCR', 'tesseract.exe'),
-            os.path.join(user_profile, 'AppData', 'Local', 'Programs', 'Tesseract-OCR', 'tesseract.exe'),
+        possible_dirs = [
+            program_files,
+            program_files_x86,
+            os.path.join(user_profile, 'AppData', 'Local', 'Programs'),
         ]
 
-        # Vérifier les chemins possibles
-        for path in possible_paths:
-            if os.path.exists(path):
-                tesseract_path = path
-                print(f"[SEARCH] Tesseract trouvé à: {path}")
-                break
+        # Vérifier les dossiers possibles
+        tesseract_path, _ = find_tesseract_install(possible_dirs)
+        if tesseract_path:
+            print(f"[SEARCH] Tesseract trouvé à: {tesseract_path}")
 
     if tesseract_path:
         # Configurer pytesseract pour utiliser le chemin spécifique
@@ -174,12 +296,12 @@ def configure_tesseract():
         # Tester la configuration
         try:
             result = subprocess.run([tesseract_path, '--version'], 
-                                  capture_output=True, text=True, timeout=10)
+                                  capture_output=True, timeout=10)
             if result.returncode == 0:
-                print(f"[TEST] Configuration testée: {result.stdout.strip()}")
+                print(f"[TEST] Configuration testée: {result.stdout.decode('utf-8', 'replace').strip()}")
                 return True
             else:
-                print(f"[ERROR] Test échoué: {result.stderr}")
+                print(f"[ERROR] Test échoué: {result.stderr.decode('utf-8', 'replace')}")
                 return False
         except Exception as e:
             print(f"[ERROR] Erreur test: {e}")
@@ -188,59 +310,255 @@ def configure_tesseract():
         print("[ERROR] Aucun exécutable Tesseract trouvé")
         return False
 
-# Configurer Tesseract au chargement du module
-TESSERACT_AVAILABLE = configure_tesseract()
+def _ensure_configured():
+    """
+    Configure Tesseract au premier appel (thread-safe) et retourne sa disponibilité
+    """
+    global TESSERACT_AVAILABLE
+
+    if TESSERACT_AVAILABLE is None:
+        with _CONFIG_LOCK:
+            if TESSERACT_AVAILABLE is None:
+                TESSERACT_AVAILABLE = configure_tesseract()
+
+    return TESSERACT_AVAILABLE
 
 
 def get_tesseract_info():
     """
     Retourne des informations sur la configuration Tesseract actuelle
     """
+    _ensure_configured()
+
     info = {
         'available': TESSERACT_AVAILABLE,
         'using_local_models': USING_LOCAL_MODELS,
-        'tessdata_prefix': os.environ.get('TESSDATA_PREFIX', 'Non défini'),
+        'tessdata_prefix': TESSDATA_PREFIX or 'Non défini',
         'tesseract_cmd': pytesseract.pytesseract.tesseract_cmd,
         'languages': []
     }
 
-    if TESSERACT_AVAILABLE:
-        tessdata_path = os.environ.get('TESSDATA_PREFIX')
-        if tessdata_path:
-            info['languages'] = get_available_languages(tessdata_path)
+    if TESSERACT_AVAILABLE and TESSDATA_PREFIX:
+        info['languages'] = list(get_available_languages(TESSDATA_PREFIX))
 
     return info
 
 
 def get_optimal_language_config():
     """
-    Retourne la configuration de langue optimale basée sur les modèles disponibles
-    Priorité: fra+eng si disponible, sinon eng, sinon premier disponible
+    Retourne la configuration de langue optimale (calculée lors de la configuration)
     """
-    if not TESSERACT_AVAILABLE:
-        return 'eng'  # Fallback par défaut
+    _ensure_configured()
+    return _OPTIMAL_LANG
 
-    tessdata_path = os.environ.get('TESSDATA_PREFIX')
-    if not tessdata_path:
-        return 'eng'  # Fallback par défaut
+def _group_words_into_lines(texts, confs, line_nums):
+    """
+    Regroupe les mots reconnus en lignes (nouvelle ligne à chaque changement de line_num)
+    line_nums peut aussi contenir une clé composite par mot, ex: (block_num, par_num, line_num)
 
-    available_languages = get_available_languages(tessdata_path)
+    Returns:
+        (list, list): Lignes reconstituées et confiance moyenne de chaque ligne
+    """
+    texts = np.asarray(texts, dtype=str)
+    confs = np.asarray(confs, dtype=np.float64)
+    line_nums = np.asarray(line_nums)
 
-    if not available_languages:
-        return 'eng'  # Fallback par défaut
+    # Filtrer les mots vides ou avec faible confiance
+    keep = (confs >= 30) & (np.char.strip(texts) != "")
+    if not keep.any():
+        return [], []
+    texts, confs, line_nums = texts[keep], confs[keep], line_nums[keep]
 
-    # Priorité aux langues françaises et anglaises
-    if 'fra' in available_languages and 'eng' in available_languages:
-        return 'fra+eng'
-    elif 'fra' in available_languages:
-        return 'fra'
-    elif 'eng' in available_languages:
-        return 'eng'
-    else:
-        # Utiliser la première langue disponible
-        return available_languages[0]
+    # Début de ligne à chaque changement de line_num entre deux mots conservés
+    changes = line_nums[1:] != line_nums[:-1]
+    if changes.ndim > 1:
+        changes = changes.any(axis=1)
+    boundaries = np.flatnonzero(changes) + 1
+    starts = np.concatenate(([0], boundaries))
+
+    # Confiance moyenne par ligne
+    avg_confs = np.add.reduceat(confs, starts) / np.diff(np.append(starts, confs.size))
+
+    lines = [" ".join(words).strip() for words in np.split(texts, boundaries)]
+
+    return lines, avg_confs.tolist()
+
+def _guess_layout_psm(gray):
+    """
+    Estime le PSM le plus adapté à la mise en page par projections de l'encre (NumPy)
+    - peu de lignes de texte: PSM 4 (colonne unique de tailles variables)
+    - gouttière verticale vide au centre: PSM 3 (segmentation automatique, multi-colonnes)
+    - sinon: PSM 6 (bloc de texte uniforme)
+    """
+    ink = np.asarray(gray) < 128
+    height, width = ink.shape
+
+    # Lignes de pixels contenant du texte (plus de 0.5% de pixels d'encre)
+    text_rows = ink.sum(axis=1) > 0.005 * width
+    if text_rows.mean() < 0.1:
+        return 4
+
+    # Recherche d'une gouttière (colonnes sans encre) dans la partie centrale de la zone
+    # de texte, marges exclues, sur les seules lignes de texte
+    col_ink = ink[text_rows].sum(axis=0)
+    ink_cols = np.flatnonzero(col_ink)
+    left, right = ink_cols[0], ink_cols[-1]
+    span = right - left + 1
+    empty = np.concatenate(([0], (col_ink[left + span // 5: right + 1 - span // 5] == 0).astype(np.int8), [0]))
+    edges = np.flatnonzero(np.diff(empty))
+    longest_gap = (edges[1::2] - edges[::2]).max() if edges.size else 0
+    if longest_gap >= 0.05 * span:
+        return 3
+
+    return 6
+
+def _run_tesseract_config(image, lang, psm, use_whitelist):
+    """
+    Exécute une passe Tesseract (sous-processus pytesseract) avec une configuration donnée
+    """
+    # OEM 1: moteur LSTM seul (le moteur legacy n'est pas chargé)
+    config = f'--oem 1 --psm {psm}'
+    if use_whitelist:
+        config += f' -c tessedit_char_whitelist={WHITELIST}'
+    data = pytesseract.image_to_data(image, lang=lang, config=config, output_type=Output.DICT)
+    # line_num repart à 1 dans chaque paragraphe: la ligne est identifiée par (bloc, paragraphe, ligne)
+    line_keys = np.column_stack((data['block_num'], data['par_num'], data['line_num']))
+    return _group_words_into_lines(data['text'], data['conf'], line_keys)
+
+def _get_tesserocr_api(lang):
+    """
+    Retourne l'instance tesserocr résidente, créée au premier appel
+    Retourne None si tesserocr n'est pas utilisable (fallback pytesseract)
+    """
+    global _API, TESSEROCR_AVAILABLE
+
+    if _API is None and TESSEROCR_AVAILABLE:
+        with _API_LOCK:
+            if _API is None and TESSEROCR_AVAILABLE:
+                try:
+                    kwargs = {'lang': lang, 'psm': tesserocr.PSM.SINGLE_BLOCK, 'oem': tesserocr.OEM.LSTM_ONLY}
+                    if TESSDATA_PREFIX:
+                        kwargs['path'] = TESSDATA_PREFIX
+                    _API = tesserocr.PyTessBaseAPI(**kwargs)
+                    print(f"[OK] API tesserocr résidente initialisée ({lang})")
+                except Exception as e:
+                    print(f"[WARNING] tesserocr indisponible, fallback pytesseract: {e}")
+                    TESSEROCR_AVAILABLE = False
+                    _API = None
+
+    return _API
+
+def _set_tesserocr_image(api, image):
+    """
+    Transmet l'image en niveaux de gris à l'API résidente directement depuis le buffer NumPy
+    (pas d'encodage PNG ni de fichier temporaire, 1 octet par pixel)
+    """
+    image = np.ascontiguousarray(image, dtype=np.uint8)
+    height, width = image.shape
+    api.SetImageBytes(image.tobytes(), width, height, 1, width)
+
+def _run_tesserocr_config(api, psm, use_whitelist):
+    """
+    Exécute une passe Tesseract avec l'API résidente (pas de sous-processus ni de rechargement des modèles)
+    L'image doit avoir été transmise au préalable avec _set_tesserocr_image
+    """
+    api.SetPageSegMode(psm)
+    api.SetVariable('tessedit_char_whitelist', WHITELIST if use_whitelist else '')
+    api.Recognize()
+
+    texts, confs, line_nums = [], [], []
+    line_num = 0
+    iterator = api.GetIterator()
+    if iterator is not None:
+        for word in tesserocr.iterate_level(iterator, tesserocr.RIL.WORD):
+            if word.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+                line_num += 1
+            texts.append(word.GetUTF8Text(tesserocr.RIL.WORD) or "")
+            confs.append(word.Confidence(tesserocr.RIL.WORD))
+            line_nums.append(line_num)
+
+    return _group_words_into_lines(texts, confs, line_nums)
+
+def _order_configs(configs, preferred_psm, win_rates):
+    """
+    Ordonne les configurations à essayer:
+    - en tête, la configuration dominante de la session (taux de victoire >= _WIN_RATE_DOMINANT),
+      sinon celles du PSM estimé par l'heuristique de mise en page
+    - puis le PSM estimé, puis par taux de victoire décroissant (tri stable: ordre de
+      _CONFIGS à égalité)
+    """
+    leader = max(configs, key=lambda config: win_rates[config])
+    if win_rates[leader] < _WIN_RATE_DOMINANT:
+        leader = None
+    return sorted(configs, key=lambda config: (config != leader, config[1] != preferred_psm, -win_rates[config]))
+
+def _sweep_configs(run_config, configs, verbose=False, parallel=False):
+    """
+    Essaie les configurations dans l'ordre et retient celle de meilleure confiance moyenne
+    La première configuration est exécutée seule: si elle atteint EARLY_EXIT_THRESHOLD, les
+    autres ne sont jamais lancées. Sinon les suivantes sont exécutées une à une ou, avec
+    parallel=True, lancées ensemble dans des threads (l'arrêt anticipé n'évite plus alors
+    que la lecture de leurs résultats)
+
+    Args:
+        run_config: Fonction (psm, use_whitelist) -> (lignes, confidences)
+        configs: Configurations (libellé, PSM, whitelist) dans l'ordre d'essai
+        parallel: Lance les configurations restantes en parallèle après la première
+
+    Returns:
+        (tuple, tuple, float): Configuration retenue, (lignes, confidences) et confiance moyenne
+    """
+    best_result = None
+    best_config = None
+    best_confidence = 0
+
+    executor = None
+    futures = {}
+    try:
+        # Parcourir les résultats dans l'ordre des configurations (sélection déterministe)
+        for i, config in enumerate(configs):
+            label, psm, use_whitelist = config
+            if verbose:
+                print(f"   [PROCESS] Test configuration {i+1}/{len(configs)}: PSM {label}")
+
+            if parallel and i == 1 and len(configs) > 2:
+                # Première configuration insuffisante: les suivantes sont lancées ensemble
+                executor = ThreadPoolExecutor(max_workers=len(configs) - 1)
+                for other in configs[1:]:
+                    futures[other] = executor.submit(run_config, other[1], other[2])
 
-def ocr_tesseract(image, return_conf=False, enhanced_preprocessing=True, verbose=False):
+            try:
+                if config in futures:
+                    lines, confidences = futures[config].result()
+                else:
+                    lines, confidences = run_config(psm, use_whitelist)
+            except Exception as e:
+                if verbose:
+                    print(f"      [ERROR] Configuration échouée: {str(e)}")
+                continue  # Essayer la configuration suivante
+
+            # Calculer la confiance moyenne de ce résultat
+            if confidences:
+                avg_confidence = sum(confidences) / len(confidences)
+                if verbose:
+                    print(f"      [STATS] Confiance moyenne: {avg_confidence:.1f}% ({len(lines)} lignes)")
+                if avg_confidence > best_confidence:
+                    best_confidence = avg_confidence
+                    best_result = (lines, confidences)
+                    best_config = config
+                # Résultat déjà excellent: inutile d'essayer les autres configurations
+                if avg_confidence >= EARLY_EXIT_THRESHOLD:
+                    if verbose:
+                        print(f"      [FAST] Seuil de {EARLY_EXIT_THRESHOLD:.0f}% atteint, arrêt anticipé")
+                    break
+    finally:
+        if executor is not None:
+            # Attendre les passes déjà lancées: pas de sous-processus tesseract orphelin
+            executor.shutdown(wait=True)
+
+    return best_config, best_result, best_confidence
+
+def ocr_tesseract(image, return_conf=False, enhanced_preprocessing=True, verbose=False, use_whitelist=False):
     """
     Effectue l'OCR avec Tesseract en utilisant les modèles locaux en priorité
 
@@ -249,11 +567,12 @@ def ocr_tesseract(image, return_conf=False, enhanced_preprocessing=True, verbose
         return_conf: Si True, retourne aussi les scores de confiance
         enhanced_preprocessing: Active le préprocessing amélioré
         verbose: Active les logs détaillés
+        use_whitelist: Ajoute une passe PSM 6 limitée aux caractères de WHITELIST
 
     Returns:
         str ou (list, list): Texte extrait ou (lignes, confidences)
     """
-    if not TESSERACT_AVAILABLE:
+    if not _ensure_configured():
         error_msg = "[ERROR] Tesseract non disponible"
         print(error_msg)
         if return_conf:
@@ -271,76 +590,56 @@ def ocr_tesseract(image, return_conf=False, enhanced_preprocessing=True, verbose
             print(f"   [LANG] Langues: {optimal_lang}")
             print(f"   [FOLDER] TESSDATA_PREFIX: {info['tessdata_prefix']}")
 
-        # Configuration améliorée pour Tesseract
-        # PSM 6: Assume a single uniform block of text
-        # PSM 3: Fully automatic page segmentation, but no OSD
-        configs = [
-            '--psm 6 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789€°.,;:!?()[]{}+-*/=@#&%',
-            '--psm 3',
-            '--psm 6',
-            '--psm 4'
-        ]
-
-        best_result = None
-        best_confidence = 0
-
-        # Essayer différentes configurations et garder la meilleure
-        for i, config in enumerate(configs):
-            try:
-                if verbose:
-                    print(f"   [PROCESS] Test configuration {i+1}/{len(configs)}: PSM {config.split('--psm ')[1].split(' ')[0] if '--psm' in config else 'default'}")
-
-                data = pytesseract.image_to_data(image, lang=optimal_lang, config=config, output_type=Output.DICT)
-                lines = []
-                confidences = []
-                current_line = ""
-                current_conf = []
-                last_line_num = -1
-
-                for j, word in enumerate(data['text']):
-                    if word.strip() == "" or data['conf'][j] < 30:  # Filtrer les mots avec faible confiance
-                        continue
-                    line_num = data['line_num'][j]
-                    if line_num != last_line_num and current_line:
-                        lines.append(current_line.strip())
-                        avg_conf = sum(current_conf)/len(current_conf) if current_conf else 0
-                        confidences.append(avg_conf)
-                        current_line = word + " "
-                        current_conf = [data['conf'][j]]
-                        last_line_num = line_num
-                    else:
-                        current_line += word + " "
-                        current_conf.append(data['conf'][j])
-                        last_line_num = line_num
-
-                if current_line:
-                    lines.append(current_line.strip())
-                    avg_conf = sum(current_conf)/len(current_conf) if current_conf else 0
-                    confidences.append(avg_conf)
-
-                # Calculer la confiance moyenne de ce résultat
-                if confidences:
-                    avg_confidence = sum(confidences) / len(confidences)
-                    if verbose:
-                        print(f"      [STATS] Confiance moyenne: {avg_confidence:.1f}% ({len(lines)} lignes)")
-                    if avg_confidence > best_confidence:
-                        best_confidence = avg_confidence
-                        best_result = (lines, confidences)
-
-            except Exception as e:
-                if verbose:
-                    print(f"      [ERROR] Configuration échouée: {str(e)}")
-                continue  # Essayer la configuration suivante
+        # Conversion en niveaux de gris une seule fois: Tesseract ne travaille que sur la
+        # luminance, chaque passe manipule ainsi 1 octet par pixel au lieu de 3
+        if isinstance(image, Image.Image):
+            if image.mode != 'L':
+                image = image.convert('L')
+        elif image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGRA2GRAY if image.shape[2] == 4 else cv2.COLOR_BGR2GRAY)
+
+        # La première configuration est exécutée seule, les autres ne sont lancées (voir
+        # _sweep_configs) que si sa confiance n'atteint pas le seuil d'arrêt anticipé
+        preferred_psm = _guess_layout_psm(image)
+        with _WIN_RATES_LOCK:
+            win_rates = dict(_WIN_RATES)
+        configs = _order_configs(((_WHITELIST_CONFIG,) if use_whitelist else ()) + _CONFIGS, preferred_psm, win_rates)
+        if verbose:
+            print(f"   [LAYOUT] PSM privilégié: {preferred_psm}")
+
+        api = _get_tesserocr_api(optimal_lang)
+        if api is not None:
+            # API résidente: passes séquentielles (une seule instance, non thread-safe)
+            # Verrou tenu pendant tout le balayage, y compris la transmission de l'image,
+            # qui se fait une seule fois sous forme de buffer brut
+            with _API_LOCK:
+                _set_tesserocr_image(api, image)
+                best_config, best_result, best_confidence = _sweep_configs(
+                    functools.partial(_run_tesserocr_config, api), configs, verbose)
+        else:
+            # Les configurations sont indépendantes: chaque appel pytesseract lance un
+            # sous-processus tesseract (GIL libéré pendant l'attente), les configurations
+            # restantes sont donc exécutées en parallèle dans des threads si la première
+            # n'atteint pas le seuil d'arrêt anticipé
+            # Conversion en image PIL ('L') une seule fois pour toutes les passes
+            # (pytesseract la refaisait à chaque appel). Le format BMP fait écrire à pytesseract
+            # un fichier temporaire non compressé au lieu d'un PNG à encoder à chaque passe
+            # (copie: l'attribut format de l'image de l'appelant n'est pas modifié)
+            image = Image.fromarray(np.asarray(image))
+            image.format = 'BMP'
+            best_config, best_result, best_confidence = _sweep_configs(
+                functools.partial(_run_tesseract_config, image, optimal_lang), configs, verbose, parallel=_PARALLEL_CONFIGS)
+
+        # Mise à jour des taux de victoire (1 pour la configuration retenue, 0 pour les autres)
+        if best_config is not None:
+            with _WIN_RATES_LOCK:
+                for config in _WIN_RATES:
+                    _WIN_RATES[config] += _WIN_RATE_ALPHA * ((config == best_config) - _WIN_RATES[config])
 
         if best_result:
-            lines, confidences = best_result
-            # Filtrer les lignes vides ou avec très faible confiance
-            filtered_lines = []
-            filtered_confs = []
-            for line, conf in zip(lines, confidences):
-                if line.strip() and conf > 20:  # Seuil de confiance minimum
-                    filtered_lines.append(line.strip())
-                    filtered_confs.append(conf)
+            # Déjà filtré par le masque NumPy de _group_words_into_lines: lignes non vides et
+            # confiance >= 30 (supérieure au seuil minimum de 20), pas de second parcours
+            filtered_lines, filtered_confs = best_result
 
             if verbose:
                 print(f"[OK] Tesseract terminé:")
@@ -369,12 +668,11 @@ def ocr_tesseract(image, return_conf=False, enhanced_preprocessing=True, verbose
         # Diagnostic en cas d'erreur
         if "tessdata" in str(e).lower() or "language" in str(e).lower():
             print("[DIAG] Diagnostic:")
-            print(f"   TESSDATA_PREFIX: {os.environ.get('TESSDATA_PREFIX', 'Non défini')}")
+            print(f"   TESSDATA_PREFIX: {TESSDATA_PREFIX or 'Non défini'}")
             print(f"   Modèles locaux: {'[OK]' if USING_LOCAL_MODELS else '[ERROR]'}")
 
-            tessdata_path = os.environ.get('TESSDATA_PREFIX')
-            if tessdata_path:
-                available_langs = get_available_languages(tessdata_path)
+            if TESSDATA_PREFIX:
+                available_langs = get_available_languages(TESSDATA_PREFIX)
                 print(f"   Langues disponibles: {available_langs}")
 
         if return_conf:
@@ -382,79 +680,106 @@ def ocr_tesseract(image, return_conf=False, enhanced_preprocessing=True, verbose
         return error_msg
 
 
-def test_tesseract_configuration():
+def _worker_init():
     """
-    Teste la configuration Tesseract et affiche des informations détaillées
-    Utile pour le debug et la validation de l'installation
+    Initialise un processus du pool: configuration Tesseract et API tesserocr résidente
+    chargées une seule fois pour toutes les images traitées par ce processus
     """
-    print("[TEST] TEST DE LA CONFIGURATION TESSERACT")
-    print("="*50)
+    global _PARALLEL_CONFIGS
 
-    # Informations générales
-    info = get_tesseract_info()
+    # Un processus par cœur: OpenCV reste monothread et les configurations Tesseract
+    # sont essayées une à une (un seul sous-processus tesseract à la fois par processus)
+    cv2.setNumThreads(1)
+    _PARALLEL_CONFIGS = False
+    if _ensure_configured():
+        _get_tesserocr_api(get_optimal_language_config())
 
-    print(f"[INFO] État général:")
-    print(f"   Disponible: {'[OK]' if info['available'] else '[ERROR]'}")
-    print(f"   Modèles locaux: {'[OK]' if info['using_local_models'] else '[ERROR]'}")
-    print(f"   Commande: {info['tesseract_cmd']}")
-    print(f"   TESSDATA_PREFIX: {info['tessdata_prefix']}")
+def _worker_ocr(image, return_conf=False):
+    """
+    OCR d'une image dans un processus du pool
+    """
+    return ocr_tesseract(image, return_conf=return_conf)
 
-    if info['languages']:
-        print(f"   Langues: {', '.join(info['languages'])}")
-    else:
-        print(f"   Langues: Aucune détectée")
+def _get_pool():
+    """
+    Retourne le pool de processus partagé, créé au premier appel
+    """
+    global _POOL
 
-    # Test des modèles locaux
-    local_tessdata = get_local_tessdata_path()
-    if local_tessdata:
-        print(f"\n[FOLDER] Modèles locaux:")
-        print(f"   Chemin: {local_tessdata}")
-        local_langs = get_available_languages(local_tessdata)
-        print(f"   Langues: {', '.join(local_langs) if local_langs else 'Aucune'}")
-
-        # Lister les fichiers de modèles
-        model_files = glob.glob(os.path.join(local_tessdata, '*.traineddata'))
-        for model_file in model_files:
-            size = os.path.getsize(model_file)
-            print(f"   [FILE] {os.path.basename(model_file)} ({size:,} bytes)")
-    else:
-        print(f"\n[FOLDER] Modèles locaux: Non trouvés")
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_worker_init)
+                atexit.register(_shutdown_pool)
 
-    # Test de la configuration optimale
-    optimal_lang = get_optimal_language_config()
-    print(f"\n[LANG] Configuration optimale: {optimal_lang}")
+    return _POOL
 
-    # Test basique si Tesseract est disponible
-    if info['available']:
-        print(f"\n[TEST] Test basique:")
-        try:
-            # Créer une image de test simple
-            from PIL import Image, ImageDraw, ImageFont
-            import io
+def _shutdown_pool():
+    """
+    Arrête le pool de processus partagé (enregistré avec atexit à sa création)
+    """
+    global _POOL
 
-            # Image de test avec du texte
-            test_image = Image.new('RGB', (300, 100), color='white')
-            draw = ImageDraw.Draw(test_image)
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=True)
+            _POOL = None
 
-            try:
-                # Essayer d'utiliser une police par défaut
-                font = ImageFont.load_default()
-            except:
-                font = None
+def ocr_tesseract_batch(images, return_conf=False):
+    """
+    Effectue l'OCR Tesseract sur plusieurs images en parallèle (un processus par cœur)
 
-            draw.text((10, 30), "Test OCR 123", fill='black', font=font)
+    Args:
+        images: Liste d'images à traiter (tableaux NumPy ou images PIL)
+        return_conf: Si True, chaque résultat est un tuple (lignes, confidences)
 
-            # Test OCR
-            result = ocr_tesseract(test_image, verbose=True)
+    Returns:
+        list: Un résultat par image, dans le même ordre que ocr_tesseract
+    """
+    images = list(images)
 
-            if "Test" in result or "OCR" in result or "123" in result:
-                print(f"   [OK] Test réussi: '{result.strip()}'")
-            else:
-                print(f"   [WARNING] Test partiel: '{result.strip()}'")
+    # Une seule image: pas de coût de démarrage du pool
+    if len(images) <= 1:
+        return [ocr_tesseract(image, return_conf=return_conf) for image in images]
 
-        except Exception as e:
-            print(f"   [ERROR] Test échoué: {e}")
+    return list(_get_pool().map(functools.partial(_worker_ocr, return_conf=return_conf), images))
+
+def ocr_tesseract_files(image_paths, return_conf=False):
+    """
+    Préprocessing ("tesseract_optimized") et OCR Tesseract d'une liste de fichiers, en pipeline:
+    l'image suivante est préparée dans un thread pendant que Tesseract traite la courante
+
+    Args:
+        image_paths: Chemins des images à traiter
+        return_conf: Si True, chaque résultat est un tuple (lignes, confidences)
+
+    Returns:
+        list: Un résultat par fichier, dans le même ordre que ocr_tesseract
+    """
+    from backend.preprocessing import preprocess_image
+
+    image_paths = list(image_paths)
 
-    print("\n" + "="*50)
+    # File bornée: au plus 2 images préparées d'avance en mémoire
+    prepared = queue.Queue(maxsize=2)
+
+    def _prepare_all():
+        for path in image_paths:
+            try:
+                prepared.put(preprocess_image(path, "tesseract_optimized"))
+            except Exception as e:
+                prepared.put(e)
+
+    results = []
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(_prepare_all)
+        for _ in range(len(image_paths)):
+            image = prepared.get()
+            if isinstance(image, Exception):
+                error_msg = f"Erreur Tesseract: {str(image)}"
+                print(f"[ERROR] {error_msg}")
+                results.append(([error_msg], [0]) if return_conf else error_msg)
+            else:
+                results.append(ocr_tesseract(image, return_conf=return_conf))
 
-    return info['available']
\ No newline at end of file
+    return results
@@ -4,11 +4,54 @@ Fournit des métriques avancées pour évaluer et améliorer la fiabilité des r
 """
 import re
 import logging
+import functools
 from typing import List, Tuple, Dict
-from collections import Counter
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Ponctuation et espaces considérés comme valides (en plus des lettres et chiffres)
+_VALID_PUNCTUATION = frozenset(" .,;:!?-()[]{}\"'€$%/\\@#&*+=<>")
+
+# Table de validité des caractères ASCII (1 = lettre, chiffre ou ponctuation valide)
+_ASCII_VALIDITY = np.array([chr(code).isalnum() or chr(code) in _VALID_PUNCTUATION for code in range(128)],
+                           dtype=np.int64)
+
+# Expressions régulières compilées une seule fois à l'import
+
+# Patterns de document structuré
+_DATE_RE = re.compile(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b', re.IGNORECASE)
+_AMOUNT_RE = re.compile(r'\b\d+[.,]\d{2}\s*[€$]\b', re.IGNORECASE)
+_REFERENCE_RE = re.compile(r'\b[A-Z]{2,}\d+\b', re.IGNORECASE)
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', re.IGNORECASE)
+_PHONE_RE = re.compile(r'\b\d{2}[\s.-]?\d{2}[\s.-]?\d{2}[\s.-]?\d{2}[\s.-]?\d{2}\b', re.IGNORECASE)
+_STRUCTURE_PATTERNS = (_DATE_RE, _AMOUNT_RE, _REFERENCE_RE, _EMAIL_RE, _PHONE_RE)
+
+# Pré-filtre: tous les patterns de structure exigent un chiffre, sauf l'email qui exige un '@'
+_DIGIT_RE = re.compile(r'\d')
+
+# Mots-clés de documents (comptés une fois par ligne et par mot-clé présent)
+_DOCUMENT_KEYWORDS = ('facture', 'invoice', 'total', 'date', 'montant', 'prix', 'tva')
+_DOCUMENT_KEYWORD_RE = re.compile('|'.join(_DOCUMENT_KEYWORDS))
+
+# Patterns d'erreurs OCR courantes
+_OCR_ERROR_PATTERNS = (
+    re.compile(r'\b[Il1|]{2,}\b', re.IGNORECASE),   # Confusion I/l/1/|
+    re.compile(r'\b[O0]{2,}\b', re.IGNORECASE),     # Confusion O/0
+    re.compile(r'\b[rn]{2,}m\b', re.IGNORECASE),    # Confusion rn/m
+    re.compile(r'\b[cl]{2,}\b', re.IGNORECASE),     # Confusion c/l
+    re.compile(r'[^\w\s.,;:!?()-]', re.IGNORECASE), # Caractères étranges
+)
+
+# Mot contenant au moins 4 caractères identiques consécutifs (le reste du mot est consommé
+# pour ne compter chaque mot qu'une fois)
+_REPEATED_CHARS_WORD_RE = re.compile(r'(\S)\1{3}\S*')
+
+# Mot-clé et montant dans une ligne (ajustement de confiance)
+_LINE_KEYWORD_RE = re.compile(r'facture|total|date|montant', re.IGNORECASE)
+_LINE_AMOUNT_RE = re.compile(r'\d+[.,]\d{2}')
+
 
 def evaluate_text_quality(lines: List[str], confidences: List[float]) -> Dict[str, float]:
     """
@@ -24,22 +67,12 @@ def evaluate_text_quality(lines: List[str], confidences: List[float]) -> Dict[st
     if not lines or not confidences:
         return {"overall_quality": 0.0, "confidence_adjusted": 0.0}
     
-    metrics = {}
-    
-    # 1. Analyse de la cohérence des caractères
-    metrics["character_consistency"] = _evaluate_character_consistency(lines)
-    
-    # 2. Analyse de la structure du document
-    metrics["document_structure"] = _evaluate_document_structure(lines)
-    
-    # 3. Analyse de la densité d'information
-    metrics["information_density"] = _evaluate_information_density(lines)
-    
-    # 4. Analyse des erreurs typiques OCR
-    metrics["ocr_error_penalty"] = _evaluate_ocr_errors(lines)
+    # Métriques 1 à 4 (ne dépendent que du texte, mémorisées)
+    metrics = dict(_evaluate_line_metrics(tuple(lines)))
     
     # 5. Confiance ajustée basée sur la qualité
     base_confidence = sum(confidences) / len(confidences)
+    metrics["mean_confidence"] = base_confidence
     quality_factor = (
         metrics["character_consistency"] * 0.3 +
         metrics["document_structure"] * 0.25 +
@@ -53,52 +86,84 @@ def evaluate_text_quality(lines: List[str], confidences: List[float]) -> Dict[st
     return metrics
 
 
-def _evaluate_character_consistency(lines: List[str]) -> float:
-    """Évalue la cohérence des caractères détectés"""
+@functools.lru_cache(maxsize=64)
+def _evaluate_line_metrics(lines: Tuple[str, ...]) -> Tuple[Tuple[str, float], ...]:
+    """
+    Métriques de qualité qui ne dépendent que du texte, mémorisées par contenu: l'ajustement
+    des confiances puis le rapport de qualité d'un même document ne les calculent qu'une fois
+    """
+    # Texte concaténé et nombre total de caractères calculés une seule fois et partagés
+    text = " ".join(lines)
+    total_chars = sum(map(len, lines))
+    
+    return (
+        # 1. Analyse de la cohérence des caractères
+        ("character_consistency", _evaluate_character_consistency(lines, text)),
+        # 2. Analyse de la structure du document
+        ("document_structure", _evaluate_document_structure(lines, text)),
+        # 3. Analyse de la densité d'information
+        ("information_density", _evaluate_information_density(lines, total_chars)),
+        # 4. Analyse des erreurs typiques OCR
+        ("ocr_error_penalty", _evaluate_ocr_errors(lines, text)),
+        # Statistiques reprises par le rapport de qualité
+        ("total_chars", total_chars),
+    )
+
+
+def _evaluate_character_consistency(lines: List[str], text: str) -> float:
+    """Évalue la cohérence des caractères détectés (text: lignes jointes par des espaces)"""
     if not lines:
         return 0.0
     
-    total_chars = 0
-    valid_chars = 0
+    # Points de code du texte en tableau numpy: les caractères ASCII sont classés par une
+    # table de correspondance (somme vectorisée), les autres une fois par caractère distinct
+    codes = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+    is_ascii = codes < 128
     
-    for line in lines:
-        for char in line:
-            total_chars += 1
-            # Caractères valides : lettres, chiffres, ponctuation courante, espaces
-            if char.isalnum() or char in " .,;:!?-()[]{}\"'€$%/\\@#&*+=<>":
-                valid_chars += 1
+    # Caractères valides : lettres, chiffres, ponctuation courante, espaces
+    valid_chars = int(_ASCII_VALIDITY[codes[is_ascii]].sum())
+    
+    other_codes, other_counts = np.unique(codes[~is_ascii], return_counts=True)
+    valid_chars += sum(int(count) for code, count in zip(other_codes.tolist(), other_counts)
+                       if chr(code).isalnum() or chr(code) in _VALID_PUNCTUATION)
+    
+    # Les espaces de jointure (valides) ne font pas partie des lignes: les retirer des comptes
+    separators = len(lines) - 1
+    total_chars = len(text) - separators
+    valid_chars -= separators
     
     return valid_chars / total_chars if total_chars > 0 else 0.0
 
 
-def _evaluate_document_structure(lines: List[str]) -> float:
-    """Évalue la structure logique du document"""
+def _evaluate_document_structure(lines: List[str], text: str) -> float:
+    """Évalue la structure logique du document (text: lignes jointes par des espaces)"""
     if not lines:
         return 0.0
     
     structure_score = 0.0
     total_weight = 0.0
     
-    # Recherche de patterns de document structuré
-    patterns = {
-        "dates": r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b',
-        "amounts": r'\b\d+[.,]\d{2}\s*[€$]\b',
-        "references": r'\b[A-Z]{2,}\d+\b',
-        "emails": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-        "phones": r'\b\d{2}[\s.-]?\d{2}[\s.-]?\d{2}[\s.-]?\d{2}[\s.-]?\d{2}\b'
-    }
-    
-    text = " ".join(lines)
+    # Recherche de patterns de document structuré, après un pré-filtre qui écarte sans lancer
+    # le moteur de regex les patterns dont le caractère déclencheur est absent du texte
+    has_digit = _DIGIT_RE.search(text) is not None
+    has_at = '@' in text
     
-    for pattern_name, pattern in patterns.items():
-        matches = len(re.findall(pattern, text, re.IGNORECASE))
+    for pattern in _STRUCTURE_PATTERNS:
+        if not (has_at if pattern is _EMAIL_RE else has_digit):
+            continue
+        matches = len(pattern.findall(text))
         if matches > 0:
             structure_score += matches * 0.2
             total_weight += 0.2
     
     # Bonus pour la présence de mots-clés de documents
-    keywords = ['facture', 'invoice', 'total', 'date', 'montant', 'prix', 'tva']
-    keyword_count = sum(1 for line in lines for keyword in keywords if keyword.lower() in line.lower())
+    # Une seule mise en minuscules par ligne; les lignes sans aucun mot-clé sont écartées par
+    # une seule recherche avant le décompte par mot-clé
+    keyword_count = 0
+    for line in lines:
+        line_lower = line.lower()
+        if _DOCUMENT_KEYWORD_RE.search(line_lower):
+            keyword_count += sum(1 for keyword in _DOCUMENT_KEYWORDS if keyword in line_lower)
     
     if keyword_count > 0:
         structure_score += keyword_count * 0.1
@@ -107,69 +172,46 @@ def _evaluate_document_structure(lines: List[str]) -> float:
     return min(1.0, structure_score / max(1.0, total_weight))
 
 
-def _evaluate_information_density(lines: List[str]) -> float:
-    """Évalue la densité d'information utile"""
+def _evaluate_information_density(lines: List[str], total_chars: int) -> float:
+    """Évalue la densité d'information utile (total_chars: somme des longueurs des lignes)"""
     if not lines:
         return 0.0
     
-    total_chars = sum(len(line) for line in lines)
-    meaningful_chars = 0
+    # Longueurs des lignes sans espaces de bord, calculées une seule fois
+    stripped_lengths = [len(line.strip()) for line in lines]
     
-    for line in lines:
-        # Compter les caractères significatifs (pas juste des espaces ou caractères isolés)
-        clean_line = line.strip()
-        if len(clean_line) > 2:  # Lignes avec au moins 3 caractères
-            meaningful_chars += len(clean_line)
+    # Compter les caractères significatifs (pas juste des espaces ou caractères isolés):
+    # lignes avec au moins 3 caractères
+    meaningful_chars = sum(length for length in stripped_lengths if length > 2)
     
     density = meaningful_chars / total_chars if total_chars > 0 else 0.0
     
     # Bonus pour les lignes de longueur raisonnable (ni trop courtes ni trop longues)
-    reasonable_lines = sum(1 for line in lines if 5 <= len(line.strip()) <= 100)
-    line_quality = reasonable_lines / len(lines) if lines else 0.0
+    reasonable_lines = sum(1 for length in stripped_lengths if 5 <= length <= 100)
+    line_quality = reasonable_lines / len(lines)
     
     return (density + line_quality) / 2
 
 
-def _evaluate_ocr_errors(lines: List[str]) -> float:
-    """Évalue la présence d'erreurs typiques OCR (retourne un score de pénalité)"""
+def _evaluate_ocr_errors(lines: List[str], text: str) -> float:
+    """
+    Évalue la présence d'erreurs typiques OCR (retourne un score de pénalité)
+    text: lignes jointes par des espaces
+    """
     if not lines:
         return 0.0
     
     error_count = 0
-    total_words = 0
+    total_words = len(text.split())
     
     # Patterns d'erreurs OCR courantes
-    error_patterns = [
-        r'\b[Il1|]{2,}\b',  # Confusion I/l/1/|
-        r'\b[O0]{2,}\b',    # Confusion O/0
-        r'\b[rn]{2,}m\b',   # Confusion rn/m
-        r'\b[cl]{2,}\b',    # Confusion c/l
-        r'[^\w\s.,;:!?()-]', # Caractères étranges
-    ]
-    
-    text = " ".join(lines)
-    words = text.split()
-    total_words = len(words)
-    
-    for pattern in error_patterns:
-        matches = len(re.findall(pattern, text, re.IGNORECASE))
+    for pattern in _OCR_ERROR_PATTERNS:
+        matches = len(pattern.findall(text))
         error_count += matches
     
-    # Recherche de mots avec trop de caractères répétés
-    for word in words:
-        if len(word) > 3:
-            # Compter les caractères consécutifs identiques
-            consecutive_count = 1
-            max_consecutive = 1
-            for i in range(1, len(word)):
-                if word[i] == word[i-1]:
-                    consecutive_count += 1
-                    max_consecutive = max(max_consecutive, consecutive_count)
-                else:
-                    consecutive_count = 1
-            
-            if max_consecutive > 3:  # Plus de 3 caractères identiques consécutifs
-                error_count += 1
+    # Recherche de mots avec trop de caractères répétés (plus de 3 caractères identiques
+    # consécutifs): un seul parcours du texte, chaque mot fautif compté une fois
+    error_count += len(_REPEATED_CHARS_WORD_RE.findall(text))
     
     return min(1.0, error_count / max(1, total_words))
 
@@ -202,9 +244,9 @@ def adjust_confidence_with_quality(lines: List[str], confidences: List[float]) -
             line_quality *= 0.7
         
         # Bonus pour les lignes avec contenu structuré
-        if any(keyword in line.lower() for keyword in ['facture', 'total', 'date', 'montant']):
+        if _LINE_KEYWORD_RE.search(line):
             line_quality *= 1.1
-        elif re.search(r'\d+[.,]\d{2}', line):  # Montants
+        elif _LINE_AMOUNT_RE.search(line):  # Montants
             line_quality *= 1.05
         
         # Appliquer l'ajustement global et individuel
@@ -232,23 +274,26 @@ def get_quality_report(lines: List[str], confidences: List[float]) -> str:
     
     metrics = evaluate_text_quality(lines, confidences)
     
-    report = f"""
-📊 RAPPORT DE QUALITÉ OCR
-========================
-
-🎯 Qualité Globale: {metrics['overall_quality']:.1f}%
-📈 Confiance Ajustée: {metrics['confidence_adjusted']:.1f}%
-
-📋 Métriques Détaillées:
-• Cohérence des caractères: {metrics['character_consistency']*100:.1f}%
-• Structure du document: {metrics['document_structure']*100:.1f}%
-• Densité d'information: {metrics['information_density']*100:.1f}%
-• Erreurs OCR détectées: {metrics['ocr_error_penalty']*100:.1f}%
-
-📝 Statistiques:
-• Nombre de lignes: {len(lines)}
-• Caractères totaux: {sum(len(line) for line in lines)}
-• Confiance moyenne originale: {sum(confidences)/len(confidences):.1f}%
-"""
+    # Agrégats (caractères totaux, confiance moyenne) repris des métriques, pas recalculés
+    report = [
+        "",
+        "📊 RAPPORT DE QUALITÉ OCR",
+        "========================",
+        "",
+        f"🎯 Qualité Globale: {metrics['overall_quality']:.1f}%",
+        f"📈 Confiance Ajustée: {metrics['confidence_adjusted']:.1f}%",
+        "",
+        "📋 Métriques Détaillées:",
+        f"• Cohérence des caractères: {metrics['character_consistency']*100:.1f}%",
+        f"• Structure du document: {metrics['document_structure']*100:.1f}%",
+        f"• Densité d'information: {metrics['information_density']*100:.1f}%",
+        f"• Erreurs OCR détectées: {metrics['ocr_error_penalty']*100:.1f}%",
+        "",
+        "📝 Statistiques:",
+        f"• Nombre de lignes: {len(lines)}",
+        f"• Caractères totaux: {metrics['total_chars']}",
+        f"• Confiance moyenne originale: {metrics['mean_confidence']:.1f}%",
+        "",
+    ]
     
-    return report
+    return "\n".join(report)
@@ -2,6 +2,8 @@
 Configuration centralisée pour l'application OCR Intelligent
 """
 from pathlib import Path
+from functools import lru_cache
+from typing import Any, Dict
 import os
 
 # Configuration des chemins
@@ -11,21 +13,37 @@ OUTPUT_DIR = PROJECT_ROOT / "output"
 CORRECTED_DIR = PROJECT_ROOT / "corrected"
 IMAGES_DIR = PROJECT_ROOT / "images"
 
-# Configuration des modèles OCR
-OCR_MODELS = {
-    "tesseract": {
-        "tessdata_path": MODELS_DIR / "tesseract" / "tessdata",
-        "languages": ["fra", "eng"]
-    },
-    "easyocr": {
-        "model_storage_directory": MODELS_DIR / "easyocr",
-        "languages": ["fr", "en"]
-    },
-    "doctr": {
-        "models_dir": MODELS_DIR / "doctr",
-        "det_arch": "db_mobilenet_v3_large",
-        "reco_arch": "crnn_vgg16_bn"
+# Configuration des modèles OCR (construite au premier appel, voir get_ocr_models)
+@lru_cache(maxsize=None)
+def get_ocr_models() -> Dict[str, Dict[str, Any]]:
+    """Retourne la configuration des modèles OCR, construite une seule fois"""
+    return {
+        "tesseract": {
+            "tessdata_path": MODELS_DIR / "tesseract" / "tessdata",
+            "languages": ["fra", "eng"]
+        },
+        "easyocr": {
+            "model_storage_directory": MODELS_DIR / "easyocr",
+            "languages": ["fr", "en"]
+        },
+        "doctr": {
+            "models_dir": MODELS_DIR / "doctr",
+            "det_arch": "db_mobilenet_v3_large",
+            "reco_arch": "crnn_vgg16_bn"
+        }
     }
+
+def __getattr__(name: str) -> Any:
+    """Compatibilité: config.OCR_MODELS reste accessible, construit à la première lecture"""
+    if name == "OCR_MODELS":
+        return get_ocr_models()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Clé du chemin de modèle dans la configuration de chaque moteur
+_MODEL_PATH_KEYS = {
+    "tesseract": "tessdata_path",
+    "easyocr": "model_storage_directory",
+    "doctr": "models_dir"
 }
 
 # Configuration de l'application
@@ -57,12 +75,18 @@ def setup_environment():
     for key, value in ENV_CONFIG.items():
         os.environ[key] = value
 
+# Répertoires déjà créés dans ce processus (évite un appel système mkdir à chaque rerun)
+_ensured_directories = set()
+
 def ensure_directories():
     """Assure que tous les répertoires nécessaires existent"""
     directories = [OUTPUT_DIR, CORRECTED_DIR, LOGGING_CONFIG["log_file"].parent]
     
     for directory in directories:
+        if directory in _ensured_directories:
+            continue
         directory.mkdir(exist_ok=True)
+        _ensured_directories.add(directory)
 
 def get_model_path(ocr_engine: str, model_type: str = None) -> Path:
     """
@@ -75,16 +99,12 @@ def get_model_path(ocr_engine: str, model_type: str = None) -> Path:
     Returns:
         Path vers le modèle
     """
-    if ocr_engine not in OCR_MODELS:
+    ocr_models = get_ocr_models()
+    if ocr_engine not in ocr_models:
         raise ValueError(f"Moteur OCR non supporté: {ocr_engine}")
     
-    config = OCR_MODELS[ocr_engine]
-    
-    if ocr_engine == "tesseract":
-        return config["tessdata_path"]
-    elif ocr_engine == "easyocr":
-        return config["model_storage_directory"]
-    elif ocr_engine == "doctr":
-        return config["models_dir"]
+    path_key = _MODEL_PATH_KEYS.get(ocr_engine)
+    if path_key is not None:
+        return ocr_models[ocr_engine][path_key]
     
     return MODELS_DIR / ocr_engine
@@ -2,7 +2,11 @@
 Configuration avancée pour le système de détection intelligente des zones
 """
 
-from typing import Dict, List, Any
+import re
+from collections import ChainMap
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping
 from backend.intelligent_zone_detector import ZoneType
 
 # Configuration par défaut pour la détection intelligente
@@ -151,6 +155,17 @@ DOCUMENT_SPECIFIC_CONFIGS = {
     }
 }
 
+def _freeze(config: Dict[str, Any]) -> Mapping[str, Any]:
+    """Vue en lecture seule d'une configuration (sous-sections comprises), construite une seule fois"""
+    return MappingProxyType({key: _freeze(value) if isinstance(value, dict) else value
+                             for key, value in config.items()})
+
+
+# Configurations figées à l'import: partagées sans copie entre les appels
+INTELLIGENT_DETECTION_CONFIG = _freeze(INTELLIGENT_DETECTION_CONFIG)
+DOCUMENT_SPECIFIC_CONFIGS = MappingProxyType({document_type: _freeze(config)
+                                              for document_type, config in DOCUMENT_SPECIFIC_CONFIGS.items()})
+
 # Patterns sémantiques étendus par langue
 SEMANTIC_PATTERNS_EXTENDED = {
     "french": {
@@ -224,7 +239,16 @@ SEMANTIC_PATTERNS_EXTENDED = {
     }
 }
 
-def get_intelligent_config(document_type: str = "default", language: str = "french") -> Dict[str, Any]:
+# Patterns compilés et figés à l'import (insensibles à la casse): les consommateurs appellent
+# pattern.search(texte); la chaîne d'origine reste disponible via pattern.pattern
+SEMANTIC_PATTERNS_EXTENDED = _freeze({
+    language: {zone_type: tuple(re.compile(pattern, re.IGNORECASE) for pattern in patterns)
+               for zone_type, patterns in zone_patterns.items()}
+    for language, zone_patterns in SEMANTIC_PATTERNS_EXTENDED.items()
+})
+
+@lru_cache(maxsize=32)
+def get_intelligent_config(document_type: str = "default", language: str = "french") -> Mapping[str, Any]:
     """
     Récupère la configuration intelligente pour un type de document
     
@@ -233,22 +257,17 @@ def get_intelligent_config(document_type: str = "default", language: str = "fren
         language: Langue du document
         
     Returns:
-        Configuration complète pour la détection intelligente
+        Configuration complète pour la détection intelligente (lecture seule, mise en cache
+        par couple type de document / langue)
     """
     
     # Configuration de base
-    if document_type in DOCUMENT_SPECIFIC_CONFIGS:
-        config = DOCUMENT_SPECIFIC_CONFIGS[document_type].copy()
-    else:
-        config = INTELLIGENT_DETECTION_CONFIG.copy()
+    base_config = DOCUMENT_SPECIFIC_CONFIGS.get(document_type, INTELLIGENT_DETECTION_CONFIG)
     
-    # Ajouter les patterns sémantiques selon la langue
-    if language in SEMANTIC_PATTERNS_EXTENDED:
-        config["semantic_patterns"] = SEMANTIC_PATTERNS_EXTENDED[language]
-    else:
-        config["semantic_patterns"] = SEMANTIC_PATTERNS_EXTENDED["french"]  # Fallback
+    # Ajouter les patterns sémantiques selon la langue (vue combinée, sans copie de la base)
+    semantic_patterns = SEMANTIC_PATTERNS_EXTENDED.get(language, SEMANTIC_PATTERNS_EXTENDED["french"])  # Fallback
     
-    return config
+    return MappingProxyType(ChainMap({"semantic_patterns": semantic_patterns}, base_config))
 
 def get_available_document_types() -> List[str]:
     """Retourne la liste des types de documents supportés"""
@@ -5,6 +5,8 @@ import os
 import sys
 import glob
 import shutil
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Configuration de l'environnement
@@ -17,6 +19,8 @@ warnings.filterwarnings("ignore")
 
 import streamlit as st
 import fitz
+import cv2
+import numpy as np
 from PIL import Image
 from streamlit.components.v1 import html
 import docx
@@ -46,6 +50,57 @@ from backend.main import run_all_ocr_methods
 from backend.export import export_to_word
 from backend.preprocessing import detect_text_zones
 
+# Dossiers de travail (relatifs au répertoire de lancement)
+IMAGES_DIR = Path("images")
+OUTPUT_DIR = Path("output")
+CORRECTED_DIR = Path("corrected")
+
+# Rendu des PDF: zoom 2x (144 DPI), plafonné pour que le plus grand côté de la page rendue ne
+# dépasse pas PDF_MAX_RENDER_SIDE pixels (les grands formats ne produisent pas d'images géantes
+# dont les pixels supplémentaires n'améliorent pas l'OCR mais multiplient le coût des filtres)
+PDF_RENDER_ZOOM = 2.0
+PDF_MAX_RENDER_SIDE = 2000
+
+# Conversion des pixmaps PyMuPDF (RGB / RGBA) vers l'ordre de canaux d'OpenCV
+_PIXMAP_TO_BGR = {3: cv2.COLOR_RGB2BGR, 4: cv2.COLOR_RGBA2BGRA}
+
+
+def _save_page_png(image_path, pixels):
+    """Encode une page en PNG (OpenCV libère le GIL pendant l'encodage) et l'écrit sur disque"""
+    ok, buffer = cv2.imencode(".png", pixels, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+    if ok:
+        buffer.tofile(image_path)
+
+
+def render_pdf_pages(doc, output_dir="images"):
+    """
+    Rastérise les pages d'un PDF en images PNG et retourne leurs chemins (dans l'ordre des pages)
+
+    Le rendu MuPDF reste séquentiel (un document fitz ne doit pas être partagé entre threads);
+    l'encodage PNG, coûteux, se fait en parallèle pendant le rendu des pages suivantes
+    Au plus max_workers pages rendues attendent leur encodage: la mémoire ne croît pas avec
+    le nombre de pages si l'encodage prend du retard sur le rendu
+    """
+    image_paths = []
+    max_workers = min(8, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        writes = deque()
+        for i, page in enumerate(doc):
+            if len(writes) >= max_workers:
+                writes.popleft().result()  # Attendre la page la plus ancienne avant d'en rendre une autre
+            zoom = min(PDF_RENDER_ZOOM, PDF_MAX_RENDER_SIDE / max(page.rect.width, page.rect.height))
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+            pixels = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
+            if pix.n in _PIXMAP_TO_BGR:
+                pixels = cv2.cvtColor(pixels, _PIXMAP_TO_BGR[pix.n])
+            image_path = os.path.join(output_dir, f"page_{i+1}.png")
+            writes.append(executor.submit(_save_page_png, image_path, pixels))
+            image_paths.append(image_path)
+        for write in writes:
+            write.result()
+    return image_paths
+
+
 def create_simple_word_document(zone_ocr_results, original_image_path):
     """
     Crée un document Word simple avec juste le texte réorganisé
@@ -378,19 +433,17 @@ st.markdown("<h1> OCR Intelligent </h1>", unsafe_allow_html=True)
 uploaded_file = st.file_uploader(" Téléversez une image ou un PDF", type=["png", "jpg", "jpeg", "pdf"])
 
 if uploaded_file:
-    os.makedirs("images", exist_ok=True)
-    os.makedirs("output", exist_ok=True)
-    file_path = os.path.join("images", uploaded_file.name)
+    # Dossiers de travail créés une seule fois par session (pas de mkdir à chaque rerun)
+    if 'work_dirs_created' not in st.session_state:
+        for work_dir in (IMAGES_DIR, OUTPUT_DIR, CORRECTED_DIR):
+            work_dir.mkdir(exist_ok=True)
+        st.session_state.work_dirs_created = True
+    file_path = str(IMAGES_DIR / uploaded_file.name)
 
     if uploaded_file.type == "application/pdf":
         doc = fitz.open(stream=uploaded_file.read(), filetype="pdf")
         st.warning(f"PDF détecté, traitement de {len(doc)} pages.")
-        image_paths = []
-        for i, page in enumerate(doc):
-            pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
-            image_path = os.path.join("images", f"page_{i+1}.png")
-            pix.save(image_path)
-            image_paths.append(image_path)
+        image_paths = render_pdf_pages(doc, IMAGES_DIR)
     else:
         with open(file_path, "wb") as f:
             f.write(uploaded_file.getbuffer())
@@ -904,16 +957,12 @@ if uploaded_file:
                 )
 
                 if corrected_file is not None:
-                    os.makedirs("corrected", exist_ok=True)
                     doc = docx.Document(corrected_file)
                     corrected_text = "\n".join([p.text for p in doc.paragraphs])
 
                     base_name = uploaded_file.name if uploaded_file else "unknown"
                     txt_name = os.path.splitext(base_name)[0] + "_corrige.txt"
-                    corrected_path = os.path.join("corrected", txt_name)
-
-                    with open(corrected_path, "w", encoding="utf-8") as f:
-                        f.write(corrected_text)
+                    (CORRECTED_DIR / txt_name).write_text(corrected_text, encoding="utf-8")
                     st.success(f"✅ Correction enregistrée")
 
 
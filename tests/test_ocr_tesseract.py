@@ -0,0 +1,138 @@
+import threading
+
+from backend import ocr_tesseract
+
+
+CONFIGS = (('6', 6, False), ('3', 3, False), ('4', 4, False))
+
+
+def _recording_runner(confidences):
+    calls = []
+    lock = threading.Lock()
+
+    def run_config(psm, use_whitelist):
+        with lock:
+            calls.append(psm)
+        return [f"psm {psm}"], [confidences[psm]]
+
+    return run_config, calls
+
+
+def test_sweep_stops_before_launching_other_configs():
+    run_config, calls = _recording_runner({6: 95.0, 3: 50.0, 4: 50.0})
+
+    for parallel in (False, True):
+        calls.clear()
+        best_config, best_result, best_confidence = ocr_tesseract._sweep_configs(run_config, CONFIGS, parallel=parallel)
+        assert calls == [6]
+        assert best_config == CONFIGS[0]
+        assert best_result == (["psm 6"], [95.0])
+        assert best_confidence == 95.0
+
+
+def test_sweep_keeps_best_config_when_threshold_is_missed():
+    run_config, calls = _recording_runner({6: 40.0, 3: 70.0, 4: 60.0})
+
+    for parallel in (False, True):
+        calls.clear()
+        best_config, _, best_confidence = ocr_tesseract._sweep_configs(run_config, CONFIGS, parallel=parallel)
+        assert sorted(calls) == [3, 4, 6]
+        assert best_config == CONFIGS[1]
+        assert best_confidence == 70.0
+
+
+def test_sweep_skips_failing_config():
+    def run_config(psm, use_whitelist):
+        if psm == 6:
+            raise RuntimeError("tesseract")
+        return ["ok"], [90.0 if psm == 3 else 20.0]
+
+    best_config, _, _ = ocr_tesseract._sweep_configs(run_config, CONFIGS, parallel=True)
+    assert best_config == CONFIGS[1]
+
+
+def test_worker_runs_configs_sequentially(monkeypatch):
+    monkeypatch.setattr(ocr_tesseract, '_PARALLEL_CONFIGS', True)
+    monkeypatch.setattr(ocr_tesseract, '_ensure_configured', lambda: False)
+
+    ocr_tesseract._worker_init()
+
+    assert ocr_tesseract._PARALLEL_CONFIGS is False
+
+
+def test_pool_is_shut_down_at_exit(monkeypatch):
+    class FakePool:
+        def __init__(self, max_workers, initializer):
+            self.max_workers = max_workers
+            self.shut_down = False
+
+        def shutdown(self, wait=True):
+            self.shut_down = wait
+
+    exit_handlers = []
+    monkeypatch.setattr(ocr_tesseract, 'ProcessPoolExecutor', FakePool)
+    monkeypatch.setattr(ocr_tesseract.atexit, 'register', exit_handlers.append)
+    monkeypatch.setattr(ocr_tesseract, '_POOL', None)
+
+    pool = ocr_tesseract._get_pool()
+    assert ocr_tesseract._get_pool() is pool
+    assert exit_handlers == [ocr_tesseract._shutdown_pool]
+
+    exit_handlers[0]()
+    assert pool.shut_down
+    assert ocr_tesseract._POOL is None
+
+
+def test_files_keep_input_order_and_report_errors(monkeypatch):
+    from backend import preprocessing
+
+    def fake_preprocess(path, method):
+        if path == "bad.png":
+            raise IOError("illisible")
+        return path
+
+    monkeypatch.setattr(preprocessing, 'preprocess_image', fake_preprocess)
+    monkeypatch.setattr(ocr_tesseract, 'ocr_tesseract', lambda image, return_conf=False: f"texte de {image}")
+
+    results = ocr_tesseract.ocr_tesseract_files(["a.png", "bad.png", "c.png"])
+
+    assert results == ["texte de a.png", "Erreur Tesseract: illisible", "texte de c.png"]
+
+
+def test_words_are_grouped_by_block_paragraph_and_line(monkeypatch):
+    # Deux paragraphes consécutifs dont les lignes portent le même line_num (1):
+    # seule la clé (block_num, par_num, line_num) permet de les séparer
+    data = {
+        'text':      ["", "Facture", "N°123", "Total", "", "45,00", "€", "bruit"],
+        'conf':      [-1, 96, 91, 88, -1, 90, 80, 12],
+        'block_num': [1, 1, 1, 1, 2, 2, 2, 2],
+        'par_num':   [1, 1, 1, 2, 1, 1, 1, 1],
+        'line_num':  [0, 1, 1, 1, 0, 1, 1, 1],
+    }
+    monkeypatch.setattr(ocr_tesseract.pytesseract, 'image_to_data', lambda *args, **kwargs: data)
+
+    lines, confidences = ocr_tesseract._run_tesseract_config(None, 'fra', 6, False)
+
+    assert lines == ["Facture N°123", "Total", "45,00 €"]
+    assert confidences == [93.5, 88.0, 85.0]
+
+
+def test_group_words_into_lines_with_plain_line_numbers():
+    lines, confidences = ocr_tesseract._group_words_into_lines(
+        ["a", "b", " ", "c"], [50, 70, 90, 40], [1, 1, 1, 2])
+
+    assert lines == ["a b", "c"]
+    assert confidences == [60.0, 40.0]
+    assert ocr_tesseract._group_words_into_lines([""], [95], [1]) == ([], [])
+
+
+def test_layout_guess_leads_without_dominant_config():
+    win_rates = {CONFIGS[0]: 0.1, CONFIGS[1]: 0.5, CONFIGS[2]: 0.3}
+
+    assert ocr_tesseract._order_configs(CONFIGS, 4, win_rates) == [CONFIGS[2], CONFIGS[1], CONFIGS[0]]
+
+
+def test_dominant_config_runs_first_despite_layout_guess():
+    win_rates = {CONFIGS[0]: 0.05, CONFIGS[1]: 0.7, CONFIGS[2]: 0.2}
+
+    assert ocr_tesseract._order_configs(CONFIGS, 4, win_rates) == [CONFIGS[1], CONFIGS[2], CONFIGS[0]]
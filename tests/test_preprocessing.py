@@ -0,0 +1,177 @@
+import os
+
+import dataclasses
+
+import cv2
+import numpy as np
+import pytest
+
+from backend import preprocessing
+from config.config_zone_detection import DEFAULT_ZONE_CONFIG
+
+
+def _text_page():
+    page = np.full((600, 800), 255, dtype=np.uint8)
+    for i in range(12):
+        cv2.putText(page, "Facture 2024 - Total TTC 1234,56 EUR", (40, 60 + 45 * i),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.9, 0, 2)
+    return page
+
+
+@pytest.mark.parametrize("angle", [3.0, -3.0])
+def test_skew_angle_is_recovered(angle):
+    page = _text_page()
+    h, w = page.shape
+    M = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+    skewed = cv2.warpAffine(page, M, (w, h), flags=cv2.INTER_CUBIC, borderValue=255)
+
+    # L'angle estimé est celui qui redresse l'image: l'opposé de la rotation appliquée
+    assert preprocessing._estimate_skew_angle(skewed) == pytest.approx(-angle, abs=0.5)
+
+
+def test_straight_page_is_not_rotated():
+    assert abs(preprocessing._estimate_skew_angle(_text_page())) < preprocessing._DESKEW_MIN_ANGLE
+
+
+@pytest.fixture
+def memoized(tmp_path):
+    preprocessing.clear_preprocess_cache()
+    calls = []
+
+    @preprocessing._memoize_by_file
+    def load(path, method="enhanced"):
+        calls.append((path, method))
+        return np.full((4, 4), len(calls), dtype=np.uint8)
+
+    path = tmp_path / "page.png"
+    path.write_bytes(b"version 1")
+    yield load, str(path), calls
+    preprocessing.clear_preprocess_cache()
+
+
+def test_cache_hit_returns_a_copy(memoized):
+    load, path, calls = memoized
+
+    first = load(path)
+    first[:] = 0
+    second = load(path)
+
+    assert len(calls) == 1
+    assert (second == 1).all()
+    second[:] = 0
+    assert (load(path) == 1).all()
+
+
+def test_cache_key_includes_method(memoized):
+    load, path, calls = memoized
+
+    load(path, "enhanced")
+    load(path, "tesseract_optimized")
+
+    assert [method for _, method in calls] == ["enhanced", "tesseract_optimized"]
+
+
+def test_changed_mtime_invalidates_entry(memoized):
+    load, path, calls = memoized
+
+    load(path)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert (load(path) == 2).all()
+    assert len(calls) == 2
+
+
+def test_changed_size_invalidates_entry(memoized):
+    load, path, calls = memoized
+
+    load(path)
+    st = os.stat(path)
+    with open(path, "wb") as f:
+        f.write(b"version 2, plus longue")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    assert (load(path) == 2).all()
+    assert len(calls) == 2
+
+
+def _pairwise_dedup(rects, threshold):
+    # Boucle paire par paire d'origine (_rects_overlap_significantly), référence du parcours glouton
+    def overlap_significantly(rect1, rect2):
+        x1, y1, w1, h1 = rect1
+        x2, y2, w2, h2 = rect2
+        x_overlap = max(0, min(x1 + w1, x2 + w2) - max(x1, x2))
+        y_overlap = max(0, min(y1 + h1, y2 + h2) - max(y1, y2))
+        if x_overlap == 0 or y_overlap == 0:
+            return False
+        min_area = min(w1 * h1, w2 * h2)
+        return (x_overlap * y_overlap / min_area if min_area > 0 else 0) > threshold
+
+    kept = []
+    for i, rect in enumerate(rects):
+        if not any(overlap_significantly(rect, rects[j]) for j in kept):
+            kept.append(i)
+    return kept
+
+
+@pytest.mark.parametrize("threshold", [0.5, 0.7])
+def test_overlap_dedup_matches_pairwise_loop(threshold):
+    rng = np.random.default_rng(0)
+    # Rectangles groupés autour de quelques centres (beaucoup de chevauchements), plus des
+    # rectangles dégénérés; plus de deux blocs pour couvrir le passage d'un bloc à l'autre
+    n = 2 * preprocessing._OVERLAP_BLOCK + 300
+    centers = rng.integers(0, 1500, size=(60, 2))[rng.integers(0, 60, size=n)]
+    xy = centers + rng.integers(-40, 40, size=(n, 2))
+    wh = rng.integers(0, 120, size=(n, 2))
+    rects = np.column_stack((xy, wh)).astype(np.int32)
+
+    expected = _pairwise_dedup(rects.tolist(), threshold)
+
+    assert preprocessing._non_overlapping_indices(rects, threshold) == expected
+    assert len(expected) < n
+
+
+@pytest.fixture
+def fake_cuda(monkeypatch):
+    # Hôte CUDA simulé: le chemin GPU est remplacé par un espion, _denoise est observé
+    calls = []
+
+    def cuda_path(gray, config):
+        calls.append(("cuda", config.denoise_method))
+        return gray
+
+    denoise = preprocessing._denoise
+
+    def cpu_denoise(enhanced, config):
+        calls.append(("cpu", config.denoise_method))
+        return denoise(enhanced, config)
+
+    monkeypatch.setattr(preprocessing, "CUDA_AVAILABLE", True)
+    monkeypatch.setattr(preprocessing, "_enhance_and_denoise_cuda", cuda_path)
+    monkeypatch.setattr(preprocessing, "_denoise", cpu_denoise)
+    return calls
+
+
+def test_cuda_path_only_replaces_the_bilateral_filter(fake_cuda):
+    page = _text_page()
+
+    preprocessing._preprocess_for_zone_detection(page, DEFAULT_ZONE_CONFIG)
+    preprocessing._preprocess_for_zone_detection(page, dataclasses.replace(DEFAULT_ZONE_CONFIG, denoise_method="guided"))
+    preprocessing._preprocess_for_zone_detection(page, dataclasses.replace(DEFAULT_ZONE_CONFIG, bilateral_noise_threshold=2.0))
+
+    assert fake_cuda == [("cuda", "bilateral"), ("cpu", "guided"), ("cpu", "bilateral")]
+
+
+@pytest.mark.skipif(not preprocessing.XIMGPROC_AVAILABLE, reason="cv2.ximgproc absent (opencv-contrib-python)")
+def test_domain_transform_is_used_on_cuda_hosts(fake_cuda):
+    page = _text_page()
+    config = dataclasses.replace(DEFAULT_ZONE_CONFIG, denoise_method="domain_transform")
+
+    preprocessing._preprocess_for_zone_detection(page, config)
+
+    assert fake_cuda == [("cpu", "domain_transform")]
+    enhanced = preprocessing.get_clahe(config.clahe_clip_limit, config.clahe_tile_size).apply(page)
+    expected = cv2.ximgproc.dtFilter(guide=enhanced, src=enhanced, sigmaSpatial=config.bilateral_d,
+                                     sigmaColor=config.bilateral_sigma_color,
+                                     mode=cv2.ximgproc.DTF_RF, numIters=1)
+    assert np.array_equal(preprocessing._denoise(enhanced, config), expected)